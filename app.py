@@ -1,10 +1,16 @@
 import os
 import json
 import re
-from datetime import datetime, timedelta, time
+from datetime import date, timedelta, time
+from itertools import chain
 
 import streamlit as st
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used without it
+    orjson = None
+
 
 # ---------------------------------
 # Page setup
@@ -43,226 +49,160 @@ if "latest_plan" not in st.session_state:
     st.session_state.latest_plan = None
 st.session_state.latest_plan = normalize_plan(st.session_state.latest_plan)
 
+# Serialized once per plan so reruns don't re-encode it for the download button.
+if "latest_plan_json" not in st.session_state:
+    st.session_state.latest_plan_json = None
+
+# Per-slot display text for the latest plan, kept out of the plan/export itself.
+if "latest_plan_slot_texts" not in st.session_state:
+    st.session_state.latest_plan_slot_texts = None
+
 
 # ---------------------------------
 # Utilities
+# These run in microseconds, so JIT-compiling them (e.g. numba @njit) would
+# cost more in dispatch overhead than it saves. Keep them plain Python and
+# precompute/cache results instead.
 # ---------------------------------
 def parse_csv_list(text: str) -> list[str]:
     items = [x.strip() for x in (text or "").split(",")]
     return [x for x in items if x]
 
 
+_RE_RANGE_HOURS = re.compile(r"(\d+(?:\.\d+)?)\s*-\s*(\d+(?:\.\d+)?)\s*(?:hours?|hrs?)")
+_RE_HOURS = re.compile(r"(\d+(?:\.\d+)?)\s*(?:hours?|hrs?)")
+_RE_MINUTES = re.compile(r"(\d+)\s*(?:mins?|minutes?)")
+_DASH_TX = str.maketrans("–—", "--")
+
+
 def parse_duration_to_minutes(duration_text: str) -> int:
     s = (duration_text or "").strip().lower()
-    s = s.replace("–", "-").replace("—", "-")
+    s = s.translate(_DASH_TX)
 
-    m = re.search(r"(\d+(\.\d+)?)\s*-\s*(\d+(\.\d+)?)\s*(hour|hours|hr|hrs)", s)
+    m = _RE_RANGE_HOURS.search(s)
     if m:
         a = float(m.group(1))
-        b = float(m.group(3))
+        b = float(m.group(2))
         return int(round(((a + b) / 2.0) * 60))
 
-    m = re.search(r"(\d+(\.\d+)?)\s*(hour|hours|hr|hrs)", s)
+    m = _RE_HOURS.search(s)
     if m:
         return int(round(float(m.group(1)) * 60))
 
-    m = re.search(r"(\d+)\s*(min|mins|minute|minutes)", s)
+    m = _RE_MINUTES.search(s)
     if m:
         return int(m.group(1))
 
     return 90
 
 
-def fmt_hhmm(dt_obj: datetime) -> str:
-    return dt_obj.strftime("%I:%M %p").lstrip("0")
+def fmt_minutes(minutes: int) -> str:
+    # Minutes since midnight -> "9:05 AM"; wraps past midnight like a clock.
+    h, m = divmod(minutes % 1440, 60)
+    return f"{h % 12 or 12}:{m:02d} {'AM' if h < 12 else 'PM'}"
+
+
+TRAVEL_MINUTES = {
+    "Walking": 15,
+    "Public Transit": 25,
+    "Rideshare/Taxi": 18,
+    "Rental Car": 20,
+}
+
+
+STOPS_PER_DAY = {
+    "Relaxed": 2,
+    "Balanced": 3,
+    "Packed": 4,
+}
 
 
 def travel_time_minutes(transport: str) -> int:
-    if transport == "Walking":
-        return 15
-    if transport == "Public Transit":
-        return 25
-    if transport == "Rideshare/Taxi":
-        return 18
-    if transport == "Rental Car":
-        return 20
-    return 20
+    return TRAVEL_MINUTES.get(transport, 20)
+
+
+def dump_json(obj, indent: bool = False) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode()
+
+
+def load_json(text: str | bytes):
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
 
 
 def safe_list_join(items):
-    items = [str(x).strip() for x in (items or []) if str(x).strip()]
-    return ", ".join(items) if items else "—"
+    if not items:
+        return "—"
+    cleaned = [s for s in (str(x).strip() for x in items) if s]
+    return ", ".join(cleaned) if cleaned else "—"
 
 
 # ---------------------------------
-# Place library (generic building blocks)
+# Place library (generic building blocks, stored in places.json)
 # Must-visits (user typed) will override these.
 # ---------------------------------
-PLACE_LIBRARY = {
-    "Food": [
-        {
-            "name": "Local Breakfast Café",
-            "duration": "45–60 min",
-            "description": "Start with local flavors and a quick energy boost.",
-            "activities": ["Try a local pastry", "Signature coffee/tea", "Light breakfast"],
-            "nearby": ["Photo-friendly streets", "Small boutique shops"],
-            "food": ["Breakfast set", "Coffee + pastry"],
-            "transport": "Walking / short ride",
-            "tips": "Arrive early to avoid the morning rush."
-        },
-        {
-            "name": "Local Market / Food Street",
-            "duration": "1.5–2 hours",
-            "description": "Taste multiple local items in one walkable area.",
-            "activities": ["Street-food tasting", "Browse snacks", "Buy souvenirs"],
-            "nearby": ["Dessert shops", "Local craft lane"],
-            "food": ["Street snacks", "Regional specialty dish"],
-            "transport": "Walking / public transit",
-            "tips": "Carry cash for small vendors."
-        },
-        {
-            "name": "Signature Dinner Spot",
-            "duration": "1.5–2 hours",
-            "description": "End the day with a well-known local dinner option.",
-            "activities": ["Order the house special", "Try a local drink", "Dessert tasting"],
-            "nearby": ["Night walk area", "Rooftop views (if available)"],
-            "food": ["Main course", "Dessert"],
-            "transport": "Rideshare/Taxi or transit",
-            "tips": "Reserve in advance if it’s popular."
-        },
-    ],
-    "Nature": [
-        {
-            "name": "Main City Park / Scenic Viewpoint",
-            "duration": "1.5–2.5 hours",
-            "description": "Fresh air, views, and easy walking.",
-            "activities": ["Short walk", "Photography", "Relaxing break"],
-            "nearby": ["Visitor center", "Lake/river promenade"],
-            "food": ["Park-side café", "Quick bites nearby"],
-            "transport": "Walking / public transit",
-            "tips": "Morning light is best; carry water."
-        },
-        {
-            "name": "Botanical Garden / Nature Trail",
-            "duration": "2–3 hours",
-            "description": "A calm block that pairs well with a relaxed pace.",
-            "activities": ["Garden trail", "Photo stops", "Rest breaks"],
-            "nearby": ["Museum area", "Coffee shops"],
-            "food": ["Garden café", "Nearby brunch spot"],
-            "transport": "Public Transit or rideshare",
-            "tips": "Check entry timings; avoid midday heat if applicable."
-        },
-    ],
-    "History": [
-        {
-            "name": "Historic Old Town Walk",
-            "duration": "2–3 hours",
-            "description": "Heritage streets, architecture, and local culture.",
-            "activities": ["Walking tour", "Architecture photos", "Small museum visit"],
-            "nearby": ["Local market", "Historic monument"],
-            "food": ["Traditional lunch spot", "Bakery"],
-            "transport": "Walking",
-            "tips": "Wear comfortable shoes."
-        },
-        {
-            "name": "Main Museum / Cultural Center",
-            "duration": "2–3 hours",
-            "description": "Understand local history and context.",
-            "activities": ["Top exhibits", "Audio guide", "Gift shop quick stop"],
-            "nearby": ["City square", "Historic site"],
-            "food": ["Museum café", "Nearby restaurant strip"],
-            "transport": "Public Transit / rideshare",
-            "tips": "Go early for fewer crowds."
-        },
-    ],
-    "Shopping": [
-        {
-            "name": "Local Bazaar / Artisan Street",
-            "duration": "1.5–2.5 hours",
-            "description": "Shop unique crafts and local items.",
-            "activities": ["Browse crafts", "Compare prices", "Pick souvenirs"],
-            "nearby": ["Street-food lane", "Photo alleys"],
-            "food": ["Snacks nearby", "Dessert stall"],
-            "transport": "Walking / transit",
-            "tips": "Carry a tote bag; bargain politely."
-        }
-    ],
-    "Nightlife": [
-        {
-            "name": "Evening Walk + Night Market",
-            "duration": "1.5–2.5 hours",
-            "description": "Lights, snacks, and local vibe for the evening.",
-            "activities": ["Night photos", "Snack tasting", "People watching"],
-            "nearby": ["Dessert spots", "Live music area"],
-            "food": ["Night snacks", "Dessert"],
-            "transport": "Walking / rideshare",
-            "tips": "Check closing times and keep valuables secure."
-        }
-    ],
-    "Adventure": [
-        {
-            "name": "Active Experience Block",
-            "duration": "2–3 hours",
-            "description": "A higher-energy activity for memorable moments.",
-            "activities": ["Guided activity", "Safety briefing", "Photos/videos"],
-            "nearby": ["Scenic stop", "Quick café"],
-            "food": ["Energy snack", "Post-activity meal"],
-            "transport": "Rideshare/Taxi / rental car",
-            "tips": "Confirm reservations; wear comfortable gear."
-        }
-    ],
-    "Relax": [
-        {
-            "name": "Spa / Slow Café + Park Time",
-            "duration": "2–3 hours",
-            "description": "A slower block for recovery and calm vibes.",
-            "activities": ["Massage/spa (optional)", "Slow café time", "Park sit-down"],
-            "nearby": ["Bookstore", "Tea shop"],
-            "food": ["Light meal", "Tea/coffee"],
-            "transport": "Walking / short ride",
-            "tips": "Book spa slots ahead on weekends."
-        }
-    ],
-}
+PLACES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "places.json")
 
 
-def pick_places(interests, num_stops, used_names: set[str], avoid_lower: set[str]):
-    picks = []
-    pools = []
-    for it in interests:
-        pools.extend(PLACE_LIBRARY.get(it, []))
-
-    if not pools:
-        for v in PLACE_LIBRARY.values():
-            pools.extend(v)
-
-    for p in pools:
-        if len(picks) >= num_stops:
-            break
-        if p["name"] in used_names:
-            continue
-        if p["name"].lower() in avoid_lower:
-            continue
-        picks.append(p)
-        used_names.add(p["name"])
-
-    if len(picks) < num_stops:
-        all_places = []
-        for v in PLACE_LIBRARY.values():
-            all_places.extend(v)
-        for p in all_places:
-            if len(picks) >= num_stops:
-                break
-            if p["name"] in used_names:
-                continue
-            if p["name"].lower() in avoid_lower:
+@st.cache_resource
+def load_place_library() -> dict[str, tuple[tuple[dict, int, str], ...]]:
+    """
+    Loads places.json once per process; every session and rerun shares the result.
+    Each place comes paired with its duration in minutes and lowercase name, resolved
+    here once instead of per slot. They sit next to the place rather than in it, so
+    they never leak into plans or the export. Treat the returned places as read-only.
+    """
+    with open(PLACES_PATH, "rb") as f:
+        library = load_json(f.read())
+
+    return {
+        interest: tuple((p, parse_duration_to_minutes(p["duration"]), p["name"].lower()) for p in places)
+        for interest, places in library.items()
+    }
+
+
+PLACE_LIBRARY = load_place_library()
+
+# Flattened once so pick_places doesn't rebuild the fallback pool on every call.
+ALL_PLACES = tuple(entry for entries in PLACE_LIBRARY.values() for entry in entries)
+
+
+def pick_places(pool, fallback, num_stops, used_names: set[str], avoid_lower: set[str]):
+    """
+    Picks up to num_stops unused places, in interest order, topping up from the library.
+    pool iterates the selected interests' library entries and fallback iterates ALL_PLACES;
+    both are shared across the days of an itinerary, so each place is checked once.
+    Returns (place, duration_min) pairs.
+    """
+    def next_unused(entries):
+        for p, dur_min, name_lower in entries:
+            if p["name"] in used_names or name_lower in avoid_lower:
                 continue
-            picks.append(p)
             used_names.add(p["name"])
+            return p, dur_min
+        return None
+
+    picks = []
+    for entries in (pool, fallback):
+        while len(picks) < num_stops:
+            pick = next_unused(entries)
+            if pick is None:
+                break
+            picks.append(pick)
 
     return picks, used_names
 
 
+PACE_NOTES = {
+    "Packed": "Pace: **Packed** (tight blocks to fit more stops).",
+    "Relaxed": "Pace: **Relaxed** (extra buffer for breaks).",
+    "Balanced": "Pace: **Balanced** (structured but flexible).",
+}
+
+
 def generate_plan_explanation(day_num: int, city: str, slot: dict, transport: str, pace: str) -> str:
     p = slot.get("place", {})
     start = slot.get("start", "—")
@@ -285,12 +225,7 @@ def generate_plan_explanation(day_num: int, city: str, slot: dict, transport: st
     if food:
         parts.append(f"Food around this stop: {safe_list_join(food)}.")
 
-    if pace == "Packed":
-        parts.append("Pace: **Packed** (tight blocks to fit more stops).")
-    elif pace == "Relaxed":
-        parts.append("Pace: **Relaxed** (extra buffer for breaks).")
-    else:
-        parts.append("Pace: **Balanced** (structured but flexible).")
+    parts.append(PACE_NOTES.get(pace, PACE_NOTES["Balanced"]))
 
     parts.append(f"Transport: **{transport}**.")
     if travel_next and travel_next > 0:
@@ -301,6 +236,7 @@ def generate_plan_explanation(day_num: int, city: str, slot: dict, transport: st
     return " ".join(parts)
 
 
+@st.cache_data(show_spinner=False, max_entries=128)
 def build_detailed_itinerary(
     city: str,
     start_date,
@@ -309,39 +245,47 @@ def build_detailed_itinerary(
     day_end_time,
     budget: str,
     pace: str,
-    interests: list[str],
+    interests: tuple[str, ...],
     transport: str,
     notes: str,
     stay_area: str,
     stay_type: str,
-    must_visit: list[str],
-    avoid: list[str],
-    food_pref: list[str]
-) -> dict:
+    must_visit: tuple[str, ...],
+    avoid: tuple[str, ...],
+    food_pref: tuple[str, ...]
+) -> tuple[dict, list[list[tuple[str, str]]]]:
+    """
+    Returns (plan, slot_texts): slot_texts[d][s] is (explanation, food nearby) for slot s
+    of day d. They are built alongside the plan (and cached with it) but kept out of the
+    plan so they don't end up in the exported JSON.
+    """
     days = max(1, (end_date - start_date).days + 1)
     avoid_lower = {a.strip().lower() for a in (avoid or []) if a.strip()}
     used_names = set()
     itinerary_days = []
+    slot_texts = []
 
     travel_gap = travel_time_minutes(transport)
 
-    if pace == "Relaxed":
-        stops_per_day = 2
-    elif pace == "Packed":
-        stops_per_day = 4
-    else:
-        stops_per_day = 3
+    stops_per_day = STOPS_PER_DAY.get(pace, 3)
 
     must_visit = must_visit or []
     must_idx = 0
 
+    # Library cursors shared by all days: the selected interests' places in order,
+    # plus the full library for top-ups.
+    pool = chain.from_iterable(PLACE_LIBRARY.get(it, ()) for it in interests)
+    fallback = iter(ALL_PLACES)
+    start_ordinal = start_date.toordinal()
+
+    # Timeline arithmetic is done in minutes since midnight.
+    day_start_min = start_time.hour * 60 + start_time.minute
+    day_end_min = day_end_time.hour * 60 + day_end_time.minute
+
     for i in range(days):
-        day_date = start_date + timedelta(days=i)
+        day_date = date.fromordinal(start_ordinal + i)
         day_date_label = day_date.strftime("%a, %b %d")
 
-        day_start_dt = datetime.combine(day_date, start_time)
-        day_end_dt = datetime.combine(day_date, day_end_time)
-
         places = []
         while must_idx < len(must_visit) and len(places) < stops_per_day:
             mv = must_visit[must_idx]
@@ -349,7 +293,7 @@ def build_detailed_itinerary(
             if mv.lower() in avoid_lower:
                 continue
 
-            places.append({
+            mv_place = {
                 "name": mv,
                 "duration": "2 hours",
                 "description": "User-selected must-visit place.",
@@ -358,21 +302,22 @@ def build_detailed_itinerary(
                 "food": ["Nearby local option"],
                 "transport": transport,
                 "tips": "Check opening hours/tickets; adjust time based on crowds."
-            })
+            }
+            places.append((mv_place, parse_duration_to_minutes(mv_place["duration"])))
             used_names.add(mv)
 
         if len(places) < stops_per_day:
-            picks, used_names = pick_places(interests, stops_per_day - len(places), used_names, avoid_lower)
+            picks, used_names = pick_places(pool, fallback, stops_per_day - len(places), used_names, avoid_lower)
             places.extend(picks)
 
         timeline = []
-        cursor = day_start_dt
+        cursor = day_start_min
 
         if (stay_area or "").strip():
-            stay_block_end = cursor + timedelta(minutes=10)
+            stay_block_end = cursor + 10
             timeline.append({
-                "start": fmt_hhmm(cursor),
-                "end": fmt_hhmm(stay_block_end),
+                "start": fmt_minutes(cursor),
+                "end": fmt_minutes(stay_block_end),
                 "place": {
                     "name": f"Start from your stay: {stay_area} ({stay_type})",
                     "duration": "10 min",
@@ -385,22 +330,29 @@ def build_detailed_itinerary(
                 },
                 "estimated_travel_to_next_min": travel_gap
             })
-            cursor = stay_block_end + timedelta(minutes=travel_gap)
+            cursor = stay_block_end + travel_gap
 
-        for idx, place in enumerate(places):
-            dur_min = parse_duration_to_minutes(place.get("duration", "90 min"))
-            end_dt = cursor + timedelta(minutes=dur_min)
+        for idx, (place, dur_min) in enumerate(places):
+            end_min = cursor + dur_min
 
-            if end_dt > day_end_dt:
+            if end_min > day_end_min:
                 break
 
             timeline.append({
-                "start": fmt_hhmm(cursor),
-                "end": fmt_hhmm(end_dt),
+                "start": fmt_minutes(cursor),
+                "end": fmt_minutes(end_min),
                 "place": place,
                 "estimated_travel_to_next_min": travel_gap if idx < len(places) - 1 else 0
             })
-            cursor = end_dt + timedelta(minutes=travel_gap)
+            cursor = end_min + travel_gap
+
+        slot_texts.append([
+            (
+                generate_plan_explanation(i + 1, city, slot, transport, pace),
+                safe_list_join(slot["place"].get("food", []))
+            )
+            for slot in timeline
+        ])
 
         itinerary_days.append({
             "day": i + 1,
@@ -415,30 +367,68 @@ def build_detailed_itinerary(
         "Days": days,
         "Budget": budget,
         "Pace": pace,
-        "Interests": interests if interests else ["Any"],
+        "Interests": list(interests) if interests else ["Any"],
         "Transport": transport,
         "Stay Area": stay_area or "—",
         "Stay Type": stay_type,
-        "Must-visit": must_visit or ["—"],
-        "Avoid": avoid or ["—"],
-        "Food Preference": food_pref or ["—"],
+        "Must-visit": list(must_visit) or ["—"],
+        "Avoid": list(avoid) or ["—"],
+        "Food Preference": list(food_pref) or ["—"],
         "Notes": notes or "—"
     }
 
-    return {"summary": summary, "days": itinerary_days}
+    return {"summary": summary, "days": itinerary_days}, slot_texts
 
 
 # ---------------------------------
-# OpenAI v2: rewrite day narrative (no new info)
+# OpenAI v2: rewrite day narratives (no new info)
 # ---------------------------------
-def ai_rewrite_day_narrative(plan_day: dict, summary: dict) -> str | None:
+@st.cache_resource
+def get_openai_client(api_key: str):
+    # Imported here so the app starts without touching openai when no key is set.
+    from openai import OpenAI
+    return OpenAI(api_key=api_key)
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def request_day_narratives(_client, model: str, payload_json: str) -> dict[str, str]:
+    # Keyed on model + payload only; failures raise and are never cached.
+    system = (
+        "Rewrite each day of the provided structured travel plan into a friendly paragraph. "
+        "CRITICAL: Do NOT add new places, activities, or facts not present in the input JSON. "
+        "Only connect and rephrase what is already in the plan. "
+        "Return a JSON object of the form {\"narratives\": {\"<day>\": \"...\"}} with one "
+        "plain-text paragraph per input day, keyed by that day's \"day\" number."
+    )
+
+    resp = _client.responses.create(
+        model=model,
+        input=[
+            {"role": "system", "content": system},
+            {"role": "user", "content": payload_json}
+        ],
+        text={"format": {"type": "json_object"}},
+        temperature=0.4,
+    )
+
+    narratives = load_json(resp.output_text).get("narratives")
+    if not isinstance(narratives, dict):
+        raise ValueError("response has no 'narratives' object")
+    # Non-string or blank entries are dropped so that day falls back to the plan-based text.
+    return {str(k): v.strip() for k, v in narratives.items() if isinstance(v, str) and v.strip()}
+
+
+def ai_rewrite_all_days(plan_days: list[dict], summary: dict) -> dict[str, str]:
+    """
+    Rewrites every day of the plan in a single OpenAI request.
+    Returns narratives keyed by str(day number); days without a rewrite are absent.
+    """
     api_key = os.getenv("OPENAI_API_KEY", "").strip()
-    if not api_key:
-        return None
+    if not api_key or not plan_days:
+        return {}
 
     try:
-        from openai import OpenAI
-        client = OpenAI(api_key=api_key)
+        client = get_openai_client(api_key)
 
         model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 
@@ -446,43 +436,33 @@ def ai_rewrite_day_narrative(plan_day: dict, summary: dict) -> str | None:
             "city": summary.get("City"),
             "pace": summary.get("Pace"),
             "transport": summary.get("Transport"),
-            "day": plan_day.get("day"),
-            "date": plan_day.get("date"),
-            "timeline": [
+            "days": [
                 {
-                    "start": t.get("start"),
-                    "end": t.get("end"),
-                    "name": (t.get("place") or {}).get("name"),
-                    "duration": (t.get("place") or {}).get("duration"),
-                    "activities": (t.get("place") or {}).get("activities", []),
-                    "nearby": (t.get("place") or {}).get("nearby", []),
-                    "food": (t.get("place") or {}).get("food", []),
-                    "tips": (t.get("place") or {}).get("tips", "")
+                    "day": plan_day.get("day"),
+                    "date": plan_day.get("date"),
+                    "timeline": [
+                        {
+                            "start": t.get("start"),
+                            "end": t.get("end"),
+                            "name": (t.get("place") or {}).get("name"),
+                            "duration": (t.get("place") or {}).get("duration"),
+                            "activities": (t.get("place") or {}).get("activities", []),
+                            "nearby": (t.get("place") or {}).get("nearby", []),
+                            "food": (t.get("place") or {}).get("food", []),
+                            "tips": (t.get("place") or {}).get("tips", "")
+                        }
+                        for t in plan_day.get("timeline", [])
+                    ]
                 }
-                for t in plan_day.get("timeline", [])
+                for plan_day in plan_days
             ]
         }
 
-        system = (
-            "Rewrite the provided structured travel plan into a friendly paragraph. "
-            "CRITICAL: Do NOT add new places, activities, or facts not present in the input JSON. "
-            "Only connect and rephrase what is already in the plan. Return plain text only."
-        )
-
-        resp = client.responses.create(
-            model=model,
-            input=[
-                {"role": "system", "content": system},
-                {"role": "user", "content": json.dumps(payload)}
-            ],
-            temperature=0.4,
-        )
-
-        return resp.output_text.strip()
+        return request_day_narratives(client, model, dump_json(payload).decode())
 
     except Exception as e:
         st.warning(f"AI rewrite failed: {e}")
-        return None
+        return {}
 
 
 # ---------------------------------
@@ -553,7 +533,7 @@ if generate:
         must_visit = parse_csv_list(must_visit_text)
         avoid = parse_csv_list(avoid_text)
 
-        plan = build_detailed_itinerary(
+        plan, slot_texts = build_detailed_itinerary(
             city=city.strip(),
             start_date=start_date,
             end_date=end_date,
@@ -561,18 +541,19 @@ if generate:
             day_end_time=day_end_time_val,
             budget=budget,
             pace=pace,
-            interests=interests,
+            interests=tuple(interests),
             transport=transport,
             notes=notes.strip(),
             stay_area=stay_area.strip(),
             stay_type=stay_type,
-            must_visit=must_visit,
-            avoid=avoid,
-            food_pref=food_pref,
+            must_visit=tuple(must_visit),
+            avoid=tuple(avoid),
+            food_pref=tuple(food_pref),
         )
 
         st.session_state.latest_plan = plan
-        st.rerun()
+        st.session_state.latest_plan_json = dump_json(plan, indent=True)
+        st.session_state.latest_plan_slot_texts = slot_texts
 
 
 # ---------------------------------
@@ -581,12 +562,16 @@ if generate:
 st.divider()
 st.subheader("🗓️ Your Itinerary (Plan + Timeline + Explanations)")
 
-data = normalize_plan(st.session_state.latest_plan)
-st.session_state.latest_plan = data
 
-if data is None:
-    st.info("Fill the trip inputs on the left and click **Generate itinerary**.")
-else:
+@st.fragment
+def render_itinerary():
+    data = normalize_plan(st.session_state.latest_plan)
+    st.session_state.latest_plan = data
+
+    if data is None:
+        st.info("Fill the trip inputs on the left and click **Generate itinerary**.")
+        return
+
     summary = data["summary"]
 
     col1, col2 = st.columns([1, 1])
@@ -596,7 +581,10 @@ else:
 
     with col2:
         st.markdown("### Export")
-        export_json = json.dumps(data, indent=2)
+        export_json = st.session_state.latest_plan_json
+        if export_json is None:
+            export_json = dump_json(data, indent=True)
+            st.session_state.latest_plan_json = export_json
         st.download_button(
             "⬇️ Download itinerary JSON",
             export_json,
@@ -606,49 +594,78 @@ else:
         )
 
     st.markdown("### Daily Plan")
-    for day in data.get("days", []):
-        with st.expander(f"Day {day.get('day')} — {day.get('date')}", expanded=(day.get("day") == 1)):
-
-            if use_ai_rewrite:
-                rewritten = ai_rewrite_day_narrative(day, summary)
-                if rewritten:
-                    st.markdown("#### 🤖 AI Day Narrative (based strictly on your plan)")
-                    st.write(rewritten)
-                    st.divider()
-                else:
-                    st.info("AI rewrite is ON, but OPENAI_API_KEY is missing or request failed. Showing plan-based explanations below.")
-                    st.divider()
-
-            for slot in day.get("timeline", []):
-                p = slot.get("place", {})
-
-                st.markdown(f"## 📍 {slot.get('start','—')} – {slot.get('end','—')} | {p.get('name','—')}")
-                st.write(f"⏱️ **Time Required:** {p.get('duration','—')}")
-                st.write(f"🚶 **Transport:** {summary.get('Transport','—')}")
-                st.write(f"🍽️ **Food Nearby:** {safe_list_join(p.get('food', []))}")
-
-                st.markdown("### 🧠 Explanation (generated from plan data)")
-                expl = generate_plan_explanation(
-                    day_num=day.get("day", 1),
-                    city=summary.get("City", "—"),
-                    slot=slot,
-                    transport=summary.get("Transport", "—"),
-                    pace=summary.get("Pace", "Balanced")
-                )
-                st.write(expl)
-
-                st.markdown("### 🎯 What you can do here (from plan)")
-                for a in p.get("activities", []):
-                    st.write(f"- {a}")
-
-                st.markdown("### 📌 Nearby places you can pair (from plan)")
-                for n in p.get("nearby", []):
-                    st.write(f"- {n}")
-
-                st.markdown("### 💡 Tip (from plan)")
-                st.write(p.get("tips", "—"))
-
-                if slot.get("estimated_travel_to_next_min", 0) > 0:
-                    st.caption(f"Next stop travel estimate: ~{slot['estimated_travel_to_next_min']} minutes")
-
-                st.divider()
+    plan_days = data.get("days", [])
+    if not plan_days:
+        return
+
+    narratives = ai_rewrite_all_days(plan_days, summary) if use_ai_rewrite else {}
+
+    plan_city = summary.get("City", "—")
+    plan_transport = summary.get("Transport", "—")
+    plan_pace = summary.get("Pace", "Balanced")
+
+    # Only the selected day is built; switching days reruns just this fragment.
+    day_labels = [f"Day {day.get('day')} — {day.get('date')}" for day in plan_days]
+    day_idx = st.radio(
+        "Day",
+        range(len(plan_days)),
+        format_func=day_labels.__getitem__,
+        horizontal=True,
+        label_visibility="collapsed"
+    )
+    day = plan_days[day_idx]
+    day_num = day.get("day", 1)
+
+    # Sessions from before slot texts were stored regenerate them below.
+    slot_texts = st.session_state.latest_plan_slot_texts
+    day_texts = slot_texts[day_idx] if slot_texts else []
+
+    if use_ai_rewrite:
+        # Looked up by day number, so a dropped or extra day can't shift the others.
+        rewritten = narratives.get(str(day_num))
+        if rewritten:
+            st.markdown("#### 🤖 AI Day Narrative (based strictly on your plan)")
+            st.write(rewritten)
+            st.divider()
+        else:
+            st.info("AI rewrite is ON, but OPENAI_API_KEY is missing or request failed. Showing plan-based explanations below.")
+            st.divider()
+
+    for slot_idx, slot in enumerate(day.get("timeline", [])):
+        p = slot.get("place", {})
+
+        if slot_idx < len(day_texts):
+            expl, food_nearby = day_texts[slot_idx]
+        else:
+            food_nearby = safe_list_join(p.get("food", []))
+            expl = generate_plan_explanation(
+                day_num=day_num,
+                city=plan_city,
+                slot=slot,
+                transport=plan_transport,
+                pace=plan_pace
+            )
+
+        # One markdown element per slot instead of one per line.
+        st.markdown("\n\n".join([
+            f"## 📍 {slot.get('start','—')} – {slot.get('end','—')} | {p.get('name','—')}",
+            f"⏱️ **Time Required:** {p.get('duration','—')}",
+            f"🚶 **Transport:** {plan_transport}",
+            f"🍽️ **Food Nearby:** {food_nearby}",
+            "### 🧠 Explanation (generated from plan data)",
+            expl,
+            "### 🎯 What you can do here (from plan)",
+            "\n".join(f"- {a}" for a in p.get("activities", [])),
+            "### 📌 Nearby places you can pair (from plan)",
+            "\n".join(f"- {n}" for n in p.get("nearby", [])),
+            "### 💡 Tip (from plan)",
+            p.get("tips", "—"),
+        ]))
+
+        if slot.get("estimated_travel_to_next_min", 0) > 0:
+            st.caption(f"Next stop travel estimate: ~{slot['estimated_travel_to_next_min']} minutes")
+
+        st.divider()
+
+
+render_itinerary()